@@ -7,6 +7,31 @@ from tag_analyzer import TagAnalyzer
 # For simplicity, we use a simple in-memory structure for rejected questions
 # In production, this should be persisted (see db.py)
 
+# System prompt pieces, formatted once per reply instead of chained f-strings
+BASE_SYSTEM_PROMPT = "You are a helpful assistant designed to connect Indian users and NRIs based on shared interests. You have knowledge of Indian culture, languages, and contemporary topics, but your primary focus is helping users find common ground and shared interests. Be respectful and inclusive of India's diverse cultures while maintaining a professional and friendly tone."
+NATIVE_LANGUAGE_PROMPT = "User's native language is {native_lang}. You can occasionally use {native_lang} phrases to make the conversation more comfortable, but keep it subtle and professional."
+PREFERRED_LANGUAGES_PROMPT = "User prefers languages: {lang_list}. You can incorporate subtle phrases from these languages when appropriate."
+COMFORT_LEVEL_PROMPTS = {
+    'native': "User is comfortable with native language conversations. You can use some native language phrases while keeping the focus on connecting people through shared interests.",
+    'mixed': "User is comfortable with mixed language conversations. You can blend English with subtle native language phrases."
+}
+
+# Follow-up question request, filled with the rejected questions and the conversation
+FOLLOWUP_QUESTION_PROMPT = (
+    "Given the conversation so far, suggest ONE relevant follow-up question. "
+    "Avoid these rejected questions: {rejected}. "
+    "Make it a simple yes/no question. "
+    "Consider Indian cultural context, traditions, festivals, cuisine, languages, or contemporary Indian topics when relevant. "
+    "Conversation: {conversation}"
+)
+
+# Most recent conversation messages sent to the model with each reply
+MAX_CONTEXT_MESSAGES = 20
+
+# Replies that answer a pending follow-up question
+REJECTION_REPLIES = frozenset({"no", "skip", "not interested", "nah", "nope"})
+YES_REPLIES = frozenset({"yes", "y", "yeah", "sure", "okay", "ok"})
+
 class Chatbot:
     def __init__(self, db=None, user_id=None, user_name=None):
         self.api_key = os.getenv('OPENAI_API_KEY')
@@ -21,6 +46,7 @@ class Chatbot:
         self.last_question = None  # Store the last follow-up question
         self.tag_analyzer = TagAnalyzer()
         self.language_preferences = None
+        self.system_prompt = None  # Built from language_preferences on first use
         
         # Load user-specific data if user_id is provided
         if self.db and self.user_id:
@@ -43,11 +69,11 @@ class Chatbot:
 
     def is_rejection(self, message):
         # Simple heuristic for rejection
-        return message.strip().lower() in {"no", "skip", "not interested", "nah", "nope"}
+        return message.strip().lower() in REJECTION_REPLIES
 
     def is_yes(self, message):
         # Check for yes responses
-        return message.strip().lower() in {"yes", "y", "yeah", "sure", "okay", "ok"}
+        return message.strip().lower() in YES_REPLIES
 
     def should_ask_followup(self):
         # Ask follow-up question after every 3 conversation turns
@@ -55,12 +81,9 @@ class Chatbot:
 
     def get_followup_question(self, context):
         # Use OpenAI to generate a relevant follow-up question with Indian cultural context
-        prompt = (
-            "Given the conversation so far, suggest ONE relevant follow-up question. "
-            "Avoid these rejected questions: " + "; ".join(self.rejected_questions) + ". "
-            "Make it a simple yes/no question. "
-            "Consider Indian cultural context, traditions, festivals, cuisine, languages, or contemporary Indian topics when relevant. "
-            "Conversation: " + str(context)
+        prompt = FOLLOWUP_QUESTION_PROMPT.format(
+            rejected="; ".join(self.rejected_questions),
+            conversation=context
         )
         response = self.client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -76,15 +99,16 @@ class Chatbot:
         self.add_user_message(message)
         
         # Check if this is a response to a follow-up question
-        if self.last_question and (self.is_yes(message) or self.is_rejection(message)):
-            if self.is_rejection(message):
+        if self.last_question:
+            reply = message.strip().lower()  # Normalize once for both checks
+            if reply in REJECTION_REPLIES:
                 # Mark the question as rejected
                 self.rejected_questions.add(self.last_question)
                 if self.db:
                     self.db.save_rejected_question(self.last_question, self.user_id)
                 self.last_question = None
                 return "Understood. Let me ask something else later."
-            else:
+            elif reply in YES_REPLIES:
                 # User said yes, mark as accepted
                 self.accepted_questions.add(self.last_question)
                 if self.db:
@@ -93,29 +117,13 @@ class Chatbot:
                 return "Great! Let's continue our conversation."
         
         # Normal conversation: get OpenAI response with Indian cultural context and language preferences
-        context = self.conversation
+        context = self.conversation[-MAX_CONTEXT_MESSAGES:]
         prompt = "\n".join([f"{r}: {m}" for r, m in context])
         
-        # Build language-aware system prompt
-        system_prompt = "You are a helpful assistant designed to connect Indian users and NRIs based on shared interests. You have knowledge of Indian culture, languages, and contemporary topics, but your primary focus is helping users find common ground and shared interests. Be respectful and inclusive of India's diverse cultures while maintaining a professional and friendly tone."
-        
-        # Add language-specific instructions based on user preferences
-        if self.language_preferences:
-            native_lang = self.language_preferences.get('native_language')
-            preferred_langs = self.language_preferences.get('preferred_languages', [])
-            comfort_level = self.language_preferences.get('language_comfort_level', 'english')
-            
-            if native_lang and native_lang != 'english':
-                system_prompt += f"\n\nUser's native language is {native_lang}. You can occasionally use {native_lang} phrases to make the conversation more comfortable, but keep it subtle and professional."
-            
-            if preferred_langs:
-                lang_list = ", ".join(preferred_langs)
-                system_prompt += f"\n\nUser prefers languages: {lang_list}. You can incorporate subtle phrases from these languages when appropriate."
-            
-            if comfort_level == 'native':
-                system_prompt += "\n\nUser is comfortable with native language conversations. You can use some native language phrases while keeping the focus on connecting people through shared interests."
-            elif comfort_level == 'mixed':
-                system_prompt += "\n\nUser is comfortable with mixed language conversations. You can blend English with subtle native language phrases."
+        # Build language-aware system prompt, reused until the preferences change
+        if self.system_prompt is None:
+            self.system_prompt = self._build_system_prompt()
+        system_prompt = self.system_prompt
         
         response = self.client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -139,6 +147,27 @@ class Chatbot:
         else:
             return bot_reply
 
+    def _build_system_prompt(self):
+        """Build the system prompt from the user's language preferences"""
+        prompt_parts = [BASE_SYSTEM_PROMPT]
+        
+        # Add language-specific instructions based on user preferences
+        if self.language_preferences:
+            native_lang = self.language_preferences.get('native_language')
+            preferred_langs = self.language_preferences.get('preferred_languages', [])
+            comfort_level = self.language_preferences.get('language_comfort_level', 'english')
+            
+            if native_lang and native_lang != 'english':
+                prompt_parts.append(NATIVE_LANGUAGE_PROMPT.format(native_lang=native_lang))
+            
+            if preferred_langs:
+                prompt_parts.append(PREFERRED_LANGUAGES_PROMPT.format(lang_list=", ".join(preferred_langs)))
+            
+            if comfort_level in COMFORT_LEVEL_PROMPTS:
+                prompt_parts.append(COMFORT_LEVEL_PROMPTS[comfort_level])
+        
+        return "\n\n".join(prompt_parts)
+
     def _analyze_and_add_tags(self):
         """Analyze conversation and add inferred tags"""
         try:
@@ -148,11 +177,9 @@ class Chatbot:
             # Analyze conversation for new tags
             inferred_tags = self.tag_analyzer.analyze_conversation_for_tags(self.conversation)
             
-            # Add new tags that aren't already present
-            for tag in inferred_tags:
-                if tag not in current_tags:
-                    self.db.add_user_tag(self.user_id, tag, "inferred")
-                    current_tags.add(tag)
+            # Add new tags that aren't already present, in one write
+            new_tags = [tag for tag in dict.fromkeys(inferred_tags) if tag not in current_tags]
+            self.db.add_user_tags(self.user_id, new_tags, "inferred")
             
             return inferred_tags
         except Exception as e:
@@ -178,8 +205,10 @@ class Chatbot:
 
     def get_question_stats(self):
         """Get statistics about questions"""
-        if self.db:
-            return self.db.get_question_stats(self.user_id)
+        # A user's question sets are loaded in __init__ and kept in step with every
+        # save, so only anonymous stats (across all users) need the database
+        if self.db and not self.user_id:
+            return self.db.get_question_stats()
         else:
             return {
                 'rejected_count': len(self.rejected_questions),
@@ -206,10 +235,29 @@ class Chatbot:
         if self.db and self.user_id:
             cleaned_tag = self.tag_analyzer.clean_tag(tag)
             if self.tag_analyzer.validate_tag(cleaned_tag):
-                self.db.add_user_tag(self.user_id, cleaned_tag, "manual")
+                # Don't store a second copy of a tag the user already has
+                if cleaned_tag not in self.db.get_user_tags(self.user_id):
+                    self.db.add_user_tag(self.user_id, cleaned_tag, "manual")
                 return True
         return False
 
+    def add_manual_tags(self, tags):
+        """Add several manual tags to the user in one write, returning how many were new"""
+        if not self.db or not self.user_id:
+            return 0
+        
+        # One read for the existing tags, then set lookups for every candidate
+        known_tags = set(self.db.get_user_tags(self.user_id))
+        new_tags = []
+        for tag in tags:
+            cleaned_tag = self.tag_analyzer.clean_tag(tag)
+            if cleaned_tag not in known_tags and self.tag_analyzer.validate_tag(cleaned_tag):
+                known_tags.add(cleaned_tag)
+                new_tags.append(cleaned_tag)
+        
+        self.db.add_user_tags(self.user_id, new_tags, "manual")
+        return len(new_tags)
+
     def remove_tag(self, tag):
         """Remove a tag from the user"""
         if self.db and self.user_id:
@@ -226,15 +274,17 @@ class Chatbot:
                 preferred_languages, 
                 language_comfort_level
             )
-            # Refresh language preferences
+            # Refresh language preferences and rebuild the system prompt on next use
             self.language_preferences = self.db.get_language_preferences(self.user_id)
+            self.system_prompt = None
             return True
         return False
 
     def get_language_preferences(self):
         """Get user language preferences"""
         if self.db and self.user_id:
-            return self.db.get_language_preferences(self.user_id)
+            # Loaded once in __init__ and refreshed by update_language_preferences
+            return self.language_preferences
         return {
             'native_language': None,
             'preferred_languages': [],
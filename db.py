@@ -1,5 +1,6 @@
 import os
 import uuid
+from datetime import datetime
 from pymongo import MongoClient
 import mongomock
 
@@ -29,6 +30,22 @@ class DB:
             self.user_tags_collection = self.db['user_tags']
             self.group_chats_collection = self.db['group_chats']
             self.group_messages_collection = self.db['group_messages']
+        
+        self._create_indexes()
+
+    def _create_indexes(self):
+        """Create indexes for the fields every per-user and per-group query filters on"""
+        # create_index is a no-op when the index already exists
+        self.users_collection.create_index('user_id')
+        self.users_collection.create_index('name')  # get_or_create_user looks users up by name
+        self.user_tags_collection.create_index([('user_id', 1), ('tag', 1)])
+        self.user_tags_collection.create_index('tag')
+        self.conversations_collection.create_index([('user_id', 1), ('timestamp', 1)])
+        self.rejected_collection.create_index('user_id')
+        self.accepted_collection.create_index('user_id')
+        self.group_chats_collection.create_index('group_id')
+        self.group_chats_collection.create_index([('user_ids', 1), ('is_active', 1)])
+        self.group_messages_collection.create_index([('group_id', 1), ('timestamp', 1)])
 
     def get_or_create_user(self, name):
         """Get existing user by name or create new user with UUID"""
@@ -39,11 +56,12 @@ class DB:
         
         # Create new user
         user_id = str(uuid.uuid4())
+        now = self._get_timestamp()
         user_doc = {
             'user_id': user_id,
             'name': name,
-            'created_at': self._get_timestamp(),
-            'profile_updated_at': self._get_timestamp(),
+            'created_at': now,
+            'profile_updated_at': now,
             'preferred_languages': [],  # List of preferred languages
             'native_language': None,    # Primary native language
             'language_comfort_level': 'english'  # Default to English
@@ -100,6 +118,14 @@ class DB:
         """Get user profile information"""
         return self.users_collection.find_one({'user_id': user_id})
 
+    def get_user_names(self, user_ids):
+        """Get a user_id -> name mapping for several users in one query"""
+        users = self.users_collection.find(
+            {'user_id': {'$in': list(user_ids)}},
+            {'user_id': 1, 'name': 1}
+        )
+        return {user['user_id']: user['name'] for user in users}
+
     def add_user_tag(self, user_id, tag, tag_type="manual"):
         """Add a tag to a user (manual or inferred)"""
         tag_doc = {
@@ -110,13 +136,27 @@ class DB:
         }
         self.user_tags_collection.insert_one(tag_doc)
 
+    def add_user_tags(self, user_id, tags, tag_type="manual"):
+        """Add several tags to a user in a single write"""
+        if not tags:
+            return
+        
+        created_at = self._get_timestamp()
+        tag_docs = [{
+            'user_id': user_id,
+            'tag': tag.lower().strip(),
+            'tag_type': tag_type,  # "manual" or "inferred"
+            'created_at': created_at
+        } for tag in tags]
+        self.user_tags_collection.insert_many(tag_docs)
+
     def get_user_tags(self, user_id, tag_type=None):
         """Get tags for a user, optionally filtered by type"""
         query = {'user_id': user_id}
         if tag_type:
             query['tag_type'] = tag_type
         
-        return [doc['tag'] for doc in self.user_tags_collection.find(query)]
+        return [doc['tag'] for doc in self.user_tags_collection.find(query, {'tag': 1, '_id': 0})]
 
     def remove_user_tag(self, user_id, tag):
         """Remove a specific tag from a user"""
@@ -127,29 +167,34 @@ class DB:
 
     def find_similar_users(self, user_id, min_common_tags=2):
         """Find users with similar tags"""
-        user_tags = set(self.get_user_tags(user_id))
+        user_tags = list(set(self.get_user_tags(user_id)))
         if not user_tags:
             return []
         
-        # Get all other users and their tags
-        all_users = self.users_collection.find({'user_id': {'$ne': user_id}})
-        similar_users = []
+        # Count common tags per user on the server instead of loading every user's tags
+        pipeline = [
+            {'$match': {'user_id': {'$ne': user_id}, 'tag': {'$in': user_tags}}},
+            {'$group': {'_id': '$user_id', 'common_tags': {'$addToSet': '$tag'}}},
+            {'$project': {'common_tags': 1, 'similarity_score': {'$size': '$common_tags'}}},
+            {'$match': {'similarity_score': {'$gte': min_common_tags}}},
+            {'$sort': {'similarity_score': -1, '_id': 1}}  # Tiebreak on user_id for a stable order
+        ]
+        matches = list(self.user_tags_collection.aggregate(pipeline))
+        if not matches:
+            return []
         
-        for user in all_users:
-            other_user_tags = set(self.get_user_tags(user['user_id']))
-            common_tags = user_tags.intersection(other_user_tags)
-            
-            if len(common_tags) >= min_common_tags:
-                similar_users.append({
-                    'user_id': user['user_id'],
-                    'name': user['name'],
-                    'common_tags': list(common_tags),
-                    'similarity_score': len(common_tags)
-                })
+        # Fetch names for the matched users in one query
+        names = self.get_user_names(match['_id'] for match in matches)
         
-        # Sort by similarity score
-        similar_users.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return similar_users
+        return [
+            {
+                'user_id': match['_id'],
+                'name': names[match['_id']],
+                'common_tags': match['common_tags'],
+                'similarity_score': match['similarity_score']
+            }
+            for match in matches if match['_id'] in names
+        ]
 
     def create_group_chat(self, topic_name, user_ids, created_by):
         """Create a new group chat"""
@@ -184,12 +229,16 @@ class DB:
         self.group_messages_collection.insert_one(message_doc)
 
     def get_group_messages(self, group_id, limit=50):
-        """Get messages for a group chat"""
-        messages = self.group_messages_collection.find(
+        """Get the most recent messages for a group chat, oldest first"""
+        # Newest-first sort with the limit lets the (group_id, timestamp) index
+        # return just the last N messages; _id breaks same-millisecond ties in
+        # insertion order, then the list is flipped back into chat order
+        messages = list(self.group_messages_collection.find(
             {'group_id': group_id}
-        ).sort('timestamp', 1).limit(limit)
+        ).sort([('timestamp', -1), ('_id', -1)]).limit(limit))
         
-        return list(messages)
+        messages.reverse()
+        return messages
 
     def get_group_info(self, group_id):
         """Get group chat information"""
@@ -209,7 +258,8 @@ class DB:
     def get_user_conversation(self, user_id):
         """Get all conversation turns for a specific user"""
         conversations = self.conversations_collection.find(
-            {'user_id': user_id}
+            {'user_id': user_id},
+            {'role': 1, 'message': 1, '_id': 0}
         ).sort('timestamp', 1)
         return [(doc['role'], doc['message']) for doc in conversations]
 
@@ -247,12 +297,12 @@ class DB:
     def get_rejected_questions(self, user_id=None):
         """Retrieve rejected questions from the database"""
         query = {'user_id': user_id} if user_id else {}
-        return [doc['question'] for doc in self.rejected_collection.find(query)]
+        return [doc['question'] for doc in self.rejected_collection.find(query, {'question': 1, '_id': 0})]
 
     def get_accepted_questions(self, user_id=None):
         """Retrieve accepted questions from the database"""
         query = {'user_id': user_id} if user_id else {}
-        return [doc['question'] for doc in self.accepted_collection.find(query)]
+        return [doc['question'] for doc in self.accepted_collection.find(query, {'question': 1, '_id': 0})]
 
     def get_question_stats(self, user_id=None):
         """Get statistics about questions"""
@@ -267,7 +317,6 @@ class DB:
 
     def _get_timestamp(self):
         """Get current timestamp for database records"""
-        from datetime import datetime
         return datetime.utcnow()
 
 def get_db():
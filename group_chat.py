@@ -1,7 +1,26 @@
 import os
+from functools import lru_cache
 from openai import OpenAI
 from datetime import datetime
 
+@lru_cache(maxsize=256)
+def _topics_for_tags(top_tags):
+    """Group chat topic suggestions for a user's top tags (a tuple, so it can be cached)"""
+    # Create topic suggestions based on tags
+    topics = []
+    for tag in top_tags:
+        topics.append(f"{tag.title()} Discussion")
+        topics.append(f"{tag.title()} Enthusiasts")
+    
+    # Add some general topics
+    topics.extend([
+        "General Discussion",
+        "Open Chat",
+        "Getting to Know Each Other"
+    ])
+    
+    return tuple(topics[:5])  # Return top 5 suggestions
+
 class GroupChat:
     def __init__(self, db, group_id, user_id, user_name):
         self.db = db
@@ -9,20 +28,21 @@ class GroupChat:
         self.user_id = user_id
         self.user_name = user_name
         self.api_key = os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = None  # Created on the first AI reply; most page renders only read messages
+        self.user_names = {}  # user_id -> display name, looked up once per instance
         
     def send_message(self, message):
         """Send a message to the group chat"""
-        # Save user message
-        self.db.add_group_message(self.group_id, self.user_id, message, "user")
-        
-        # Get group info and participants
+        # Get group info and participants before doing any other work
         group_info = self.db.get_group_info(self.group_id)
         if not group_info:
             return "Error: Group not found"
         
-        # Get recent messages for context
-        recent_messages = self.db.get_group_messages(self.group_id, limit=20)
+        # Save user message
+        self.db.add_group_message(self.group_id, self.user_id, message, "user")
+        
+        # Get recent messages for context (only the last 10 go into the prompt)
+        recent_messages = self.db.get_group_messages(self.group_id, limit=10)
         
         # Generate AI response
         ai_response = self._generate_ai_response(recent_messages, group_info)
@@ -50,6 +70,8 @@ class GroupChat:
         """
         
         try:
+            if self.client is None:
+                self.client = OpenAI(api_key=self.api_key)
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
@@ -80,8 +102,24 @@ class GroupChat:
         if user_id == "ai_bot":
             return "AI Assistant"
         
-        user_profile = self.db.get_user_profile(user_id)
-        return user_profile['name'] if user_profile else "Unknown User"
+        if user_id not in self.user_names:
+            user_profile = self.db.get_user_profile(user_id)
+            self.user_names[user_id] = user_profile['name'] if user_profile else "Unknown User"
+        return self.user_names[user_id]
+    
+    def get_participant_names(self, group_info):
+        """Get participant names in group order, looking up all users in one query"""
+        user_names = self.db.get_user_names(uid for uid in group_info['user_ids'] if uid != "ai_bot")
+        self.user_names.update(user_names)  # Reused by get_messages and AI replies
+        
+        participant_names = []
+        for uid in group_info['user_ids']:
+            if uid == "ai_bot":
+                participant_names.append("AI Assistant")
+            elif uid in user_names:
+                participant_names.append(user_names[uid])
+        
+        return participant_names
     
     def get_messages(self, limit=50):
         """Get group chat messages"""
@@ -120,14 +158,14 @@ class GroupChatManager:
         groups = self.db.get_user_group_chats(user_id)
         formatted_groups = []
         
+        # Look up every participant's name across all groups in one query
+        user_names = self.db.get_user_names(
+            {uid for group in groups for uid in group['user_ids'] if uid != "ai_bot"}
+        )
+        
         for group in groups:
             # Get participant names
-            participant_names = []
-            for uid in group['user_ids']:
-                if uid != "ai_bot":
-                    user_profile = self.db.get_user_profile(uid)
-                    if user_profile:
-                        participant_names.append(user_profile['name'])
+            participant_names = [user_names[uid] for uid in group['user_ids'] if uid in user_names]
             
             # Add AI bot to participants
             participant_names.append("AI Assistant")
@@ -158,17 +196,5 @@ class GroupChatManager:
         if not user_tags:
             return ["General Discussion", "Getting to Know Each Other", "Open Chat"]
         
-        # Create topic suggestions based on tags
-        topics = []
-        for tag in user_tags[:3]:  # Use top 3 tags
-            topics.append(f"{tag.title()} Discussion")
-            topics.append(f"{tag.title()} Enthusiasts")
-        
-        # Add some general topics
-        topics.extend([
-            "General Discussion",
-            "Open Chat",
-            "Getting to Know Each Other"
-        ])
-        
-        return topics[:5]  # Return top 5 suggestions 
\ No newline at end of file
+        # Only the top 3 tags shape the suggestions, so they key the cache
+        return list(_topics_for_tags(tuple(user_tags[:3]))) 
\ No newline at end of file
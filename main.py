@@ -22,6 +22,7 @@ File Structure:
 
 """
 import os
+from operator import itemgetter
 from dotenv import load_dotenv
 import streamlit as st
 
@@ -34,24 +35,111 @@ from db import get_db
 from group_chat import GroupChatManager
 from session_manager import session_manager
 
+# Icon shown next to each suggestion, by the category it came from
+SUGGESTION_SOURCE_EMOJIS = {"ai": "🎯", "category": "📂", "synonym": "🔄", "related": "🔗"}
+
+# Card icons for the tag discovery view
+TAG_ICONS = {
+    # Technology & Digital
+    'technology': '💻', 'programming': '⌨️', 'ai': '🤖', 'startup': '🚀', 'digital': '📱',
+    'mobile apps': '📲', 'web development': '🌐', 'data science': '📊',
+    
+    # Entertainment & Media
+    'music': '🎵', 'movies': '🎬', 'bollywood': '🎭', 'gaming': '🎮', 'streaming': '📺',
+    'podcasts': '🎧', 'comedy': '😄', 'dance': '💃',
+    
+    # Sports & Fitness
+    'sports': '⚽', 'cricket': '🏏', 'fitness': '💪', 'yoga': '🧘', 'gym': '🏋️',
+    'running': '🏃', 'swimming': '🏊', 'badminton': '🏸',
+    
+    # Food & Cuisine
+    'food': '🍕', 'cooking': '👨‍🍳', 'indian food': '🍛', 'street food': '🌮',
+    'biryani': '🍚', 'desserts': '🍰', 'healthy eating': '🥗',
+    
+    # Travel & Adventure
+    'travel': '✈️', 'adventure': '🗺️', 'hiking': '🥾', 'photography': '📸',
+    'backpacking': '🎒', 'road trips': '🚗', 'international travel': '🌍',
+    
+    # Arts & Culture
+    'art': '🎨', 'culture': '🏺', 'classical music': '🎼', 'folk art': '🎪',
+    'traditional crafts': '🛠️', 'painting': '🖼️',
+    
+    # Business & Career
+    'business': '💼', 'entrepreneurship': '💡', 'career': '📈', 'finance': '💰',
+    'investing': '📈', 'marketing': '📢', 'consulting': '🤝',
+    
+    # Education & Learning
+    'education': '🎓', 'learning': '📚', 'online courses': '💻', 'languages': '🗣️',
+    'reading': '📖', 'writing': '✍️', 'research': '🔬',
+    
+    # Health & Wellness
+    'health': '🏥', 'wellness': '🌿', 'meditation': '🧘‍♀️', 'ayurveda': '🌱',
+    'mental health': '🧠', 'nutrition': '🥑', 'fitness': '💪',
+    
+    # Lifestyle & Personal
+    'fashion': '👗', 'beauty': '💄', 'lifestyle': '🌟', 'self-improvement': '📈',
+    'motivation': '💪', 'productivity': '⚡', 'minimalism': '📦',
+    
+    # Social & Community
+    'community': '👥', 'volunteering': '🤝', 'social work': '❤️', 'networking': '🌐',
+    'mentoring': '👨‍🏫', 'leadership': '👑',
+    
+    # Creative & Hobbies
+    'photography': '📸', 'writing': '✍️', 'poetry': '📝', 'music production': '🎹',
+    'gardening': '🌱', 'diy': '🔧', 'crafts': '🎨',
+    
+    # Regional & Cultural
+    'regional cinema': '🎬', 'classical dance': '💃', 'folk music': '🎵',
+    'traditional festivals': '🎉', 'heritage': '🏛️',
+    
+    # Contemporary
+    'sustainability': '♻️', 'environment': '🌱', 'social media': '📱', 'influencer': '⭐',
+    'content creation': '📹', 'digital nomad': '💻'
+}
+
+# Indian languages offered in the language preference form
+INDIAN_LANGUAGES = (
+    'hindi', 'english', 'bengali', 'telugu', 'marathi', 'tamil', 'gujarati', 
+    'kannada', 'odia', 'punjabi', 'assamese', 'sanskrit', 'urdu', 'malayalam',
+    'konkani', 'manipuri', 'nepali', 'bodo', 'santhali', 'dogri', 'kashmiri'
+)
+
+# Native language choices (blank for none) and each language's position among them
+NATIVE_LANGUAGE_OPTIONS = ('',) + INDIAN_LANGUAGES
+NATIVE_LANGUAGE_INDEX = {lang: index for index, lang in enumerate(NATIVE_LANGUAGE_OPTIONS)}
+
+# Language comfort choices as (value, label), in selectbox order
+COMFORT_LEVEL_OPTIONS = (
+    ('english', 'English Only'),
+    ('mixed', 'Mixed Language (English + Native)'),
+    ('native', 'Native Language Preferred')
+)
+
+# Sidebar navigation views, in menu order
+VIEW_OPTIONS = {
+    'chat': '💬 Chat',
+    'profile': '👤 Profile & Tags',
+    'similar_users': '🤝 Similar Users',
+    'group_chats': '👥 Group Chats',
+    'group_chat': '💬 Group Chat'
+}
+
+# Menu position of each view, so the selectbox index is a dict lookup
+VIEW_INDEX = {view: index for index, view in enumerate(VIEW_OPTIONS)}
+
 # Function definitions
 def _show_chat_interface(chatbot):
     """Show the main chat interface with Indian cultural context"""
     # Update last activity
     session_manager.update_last_activity()
     
-    # Personalized greeting with subtle cultural context
+    # Greeting is the same for every language preference
+    st.markdown("### 👋 How can I help you today?")
+    st.markdown("*Welcome back! I'm here to help you connect with people who share your interests.*")
+    
     lang_prefs = chatbot.get_language_preferences()
     native_lang = lang_prefs.get('native_language')
     
-    if native_lang and native_lang != 'english':
-        # Subtle personalized greeting
-        st.markdown("### 👋 How can I help you today?")
-        st.markdown(f"*Welcome back! I'm here to help you connect with people who share your interests.*")
-    else:
-        st.markdown("### 👋 How can I help you today?")
-        st.markdown("*Welcome back! I'm here to help you connect with people who share your interests.*")
-    
     # Show language preferences if set (optional)
     if native_lang or lang_prefs.get('preferred_languages'):
         with st.expander("🌐 Language Preferences"):
@@ -130,6 +218,16 @@ def _show_chat_interface(chatbot):
             else:
                 st.write("No rejected questions yet.")
 
+def _merge_suggestions(suggestion_groups):
+    """Merge (suggestions, source) groups into unique suggestions and their sources"""
+    suggestion_sources = {}
+    for suggestions, source in suggestion_groups:
+        for tag in suggestions:
+            # If tag appears in multiple categories, keep the first source
+            suggestion_sources.setdefault(tag, source)
+    
+    return list(suggestion_sources), suggestion_sources
+
 def _show_profile_interface(chatbot):
     """Show user profile and tag management interface with Indian cultural context"""
     # Update last activity
@@ -144,42 +242,30 @@ def _show_profile_interface(chatbot):
     # Get current language preferences
     lang_prefs = chatbot.get_language_preferences()
     
-    # Indian languages list
-    indian_languages = [
-        'hindi', 'english', 'bengali', 'telugu', 'marathi', 'tamil', 'gujarati', 
-        'kannada', 'odia', 'punjabi', 'assamese', 'sanskrit', 'urdu', 'malayalam',
-        'konkani', 'manipuri', 'nepali', 'bodo', 'santhali', 'dogri', 'kashmiri'
-    ]
-    
     with st.form("language_preferences"):
         col1, col2 = st.columns(2)
         
         with col1:
             native_language = st.selectbox(
                 "Native Language / मातृभाषा:",
-                options=[''] + indian_languages,
-                index=0 if not lang_prefs['native_language'] else 
-                      indian_languages.index(lang_prefs['native_language']) + 1,
+                options=NATIVE_LANGUAGE_OPTIONS,
+                index=NATIVE_LANGUAGE_INDEX.get(lang_prefs['native_language'] or '', 0),
                 help="Select your primary native language"
             )
             
             language_comfort_level = st.selectbox(
                 "Language Comfort Level / भाषा स्तर:",
-                options=[
-                    ('english', 'English Only'),
-                    ('mixed', 'Mixed Language (English + Native)'),
-                    ('native', 'Native Language Preferred')
-                ],
+                options=COMFORT_LEVEL_OPTIONS,
                 index=0 if lang_prefs['language_comfort_level'] == 'english' else
                       1 if lang_prefs['language_comfort_level'] == 'mixed' else 2,
-                format_func=lambda x: x[1],
+                format_func=itemgetter(1),
                 help="How comfortable are you with native language conversations?"
             )
         
         with col2:
             preferred_languages = st.multiselect(
                 "Preferred Languages / पसंदीदा भाषाएं:",
-                options=indian_languages,
+                options=INDIAN_LANGUAGES,
                 default=lang_prefs['preferred_languages'],
                 help="Select languages you're comfortable with"
             )
@@ -201,8 +287,9 @@ def _show_profile_interface(chatbot):
     st.markdown("### 🏷️ Your Tags")
     
     user_tags = chatbot.get_user_tags()
-    manual_tags = [tag for tag in user_tags if chatbot.db.get_user_tags(chatbot.user_id, "manual")]
-    inferred_tags = [tag for tag in user_tags if tag not in manual_tags]
+    manual_tag_set = set(chatbot.db.get_user_tags(chatbot.user_id, "manual"))  # One query, set lookups
+    manual_tags = [tag for tag in user_tags if tag in manual_tag_set]
+    inferred_tags = [tag for tag in user_tags if tag not in manual_tag_set]
     
     # Manual tags
     st.markdown("#### Manual Tags")
@@ -232,83 +319,18 @@ def _show_profile_interface(chatbot):
     
     # Get popular and suggested tags for swiping
     popular_tags = chatbot.tag_analyzer.get_popular_tags(chatbot.db)
-    current_user_tags = set(chatbot.get_user_tags())
+    current_user_tags = set(user_tags)
     
     # Filter out tags user already has
     available_tags = [tag for tag in popular_tags if tag not in current_user_tags]
     
     if available_tags:
-        # Create a session state for current card index
-        if 'card_index' not in st.session_state:
-            st.session_state.card_index = 0
-        
-        if 'swiped_tags' not in st.session_state:
-            st.session_state.swiped_tags = {'liked': [], 'disliked': []}
-        
         # Display current card
         if st.session_state.card_index < len(available_tags):
             current_tag = available_tags[st.session_state.card_index]
             
             # Card styling with emojis and icons
-            tag_icons = {
-                # Technology & Digital
-                'technology': '💻', 'programming': '⌨️', 'ai': '🤖', 'startup': '🚀', 'digital': '📱',
-                'mobile apps': '📲', 'web development': '🌐', 'data science': '📊',
-                
-                # Entertainment & Media
-                'music': '🎵', 'movies': '🎬', 'bollywood': '🎭', 'gaming': '🎮', 'streaming': '📺',
-                'podcasts': '🎧', 'comedy': '😄', 'dance': '💃',
-                
-                # Sports & Fitness
-                'sports': '⚽', 'cricket': '🏏', 'fitness': '💪', 'yoga': '🧘', 'gym': '🏋️',
-                'running': '🏃', 'swimming': '🏊', 'badminton': '🏸',
-                
-                # Food & Cuisine
-                'food': '🍕', 'cooking': '👨‍🍳', 'indian food': '🍛', 'street food': '🌮',
-                'biryani': '🍚', 'desserts': '🍰', 'healthy eating': '🥗',
-                
-                # Travel & Adventure
-                'travel': '✈️', 'adventure': '🗺️', 'hiking': '🥾', 'photography': '📸',
-                'backpacking': '🎒', 'road trips': '🚗', 'international travel': '🌍',
-                
-                # Arts & Culture
-                'art': '🎨', 'culture': '🏺', 'classical music': '🎼', 'folk art': '🎪',
-                'traditional crafts': '🛠️', 'painting': '🖼️',
-                
-                # Business & Career
-                'business': '💼', 'entrepreneurship': '💡', 'career': '📈', 'finance': '💰',
-                'investing': '📈', 'marketing': '📢', 'consulting': '🤝',
-                
-                # Education & Learning
-                'education': '🎓', 'learning': '📚', 'online courses': '💻', 'languages': '🗣️',
-                'reading': '📖', 'writing': '✍️', 'research': '🔬',
-                
-                # Health & Wellness
-                'health': '🏥', 'wellness': '🌿', 'meditation': '🧘‍♀️', 'ayurveda': '🌱',
-                'mental health': '🧠', 'nutrition': '🥑', 'fitness': '💪',
-                
-                # Lifestyle & Personal
-                'fashion': '👗', 'beauty': '💄', 'lifestyle': '🌟', 'self-improvement': '📈',
-                'motivation': '💪', 'productivity': '⚡', 'minimalism': '📦',
-                
-                # Social & Community
-                'community': '👥', 'volunteering': '🤝', 'social work': '❤️', 'networking': '🌐',
-                'mentoring': '👨‍🏫', 'leadership': '👑',
-                
-                # Creative & Hobbies
-                'photography': '📸', 'writing': '✍️', 'poetry': '📝', 'music production': '🎹',
-                'gardening': '🌱', 'diy': '🔧', 'crafts': '🎨',
-                
-                # Regional & Cultural
-                'regional cinema': '🎬', 'classical dance': '💃', 'folk music': '🎵',
-                'traditional festivals': '🎉', 'heritage': '🏛️',
-                
-                # Contemporary
-                'sustainability': '♻️', 'environment': '🌱', 'social media': '📱', 'influencer': '⭐',
-                'content creation': '📹', 'digital nomad': '💻'
-            }
-            
-            icon = tag_icons.get(current_tag, '🏷️')
+            icon = TAG_ICONS.get(current_tag, '🏷️')
             
             # Card container
             with st.container():
@@ -461,50 +483,24 @@ def _show_profile_interface(chatbot):
             # Get language preferences for context-aware suggestions
             language_preferences = chatbot.get_language_preferences()
             
-            # Dynamic suggestions using AI
-            ai_suggestions = chatbot.tag_analyzer.generate_dynamic_tag_suggestions(user_tags, conversation, language_preferences)
-            
-            # Category-based suggestions
-            category_suggestions = chatbot.tag_analyzer.generate_category_suggestions(user_tags)
-            
-            # Synonym suggestions
-            synonym_suggestions = chatbot.tag_analyzer.generate_synonym_suggestions(user_tags)
-            
-            # Related concept suggestions
-            related_suggestions = chatbot.tag_analyzer.generate_related_concept_suggestions(user_tags)
-        
-        # Collect all suggestions and track duplicates
-        all_suggestions = []
-        seen_suggestions = set()
-        suggestion_sources = {}  # Track which category each suggestion came from
-        
-        # Helper function to add suggestions with source tracking
-        def add_suggestions_with_source(suggestions, source):
-            for tag in suggestions:
-                if tag not in seen_suggestions:
-                    all_suggestions.append(tag)
-                    seen_suggestions.add(tag)
-                    suggestion_sources[tag] = source
-                elif tag in suggestion_sources:
-                    # If tag appears in multiple categories, keep the first source
-                    pass
+            # Dynamic, category, synonym and related concept suggestions, requested in parallel
+            suggestions = chatbot.tag_analyzer.generate_all_suggestions(user_tags, conversation, language_preferences)
+            ai_suggestions = suggestions['ai']
+            category_suggestions = suggestions['category']
+            synonym_suggestions = suggestions['synonym']
+            related_suggestions = suggestions['related']
         
-        # Add suggestions from each category
-        if ai_suggestions:
-            add_suggestions_with_source(ai_suggestions, "ai")
-        if category_suggestions:
-            add_suggestions_with_source(category_suggestions, "category")
-        if synonym_suggestions:
-            add_suggestions_with_source(synonym_suggestions, "synonym")
-        if related_suggestions:
-            add_suggestions_with_source(related_suggestions, "related")
+        # Collect all suggestions, tracking which category each one came from
+        all_suggestions, suggestion_sources = _merge_suggestions([
+            (ai_suggestions, "ai"),
+            (category_suggestions, "category"),
+            (synonym_suggestions, "synonym"),
+            (related_suggestions, "related")
+        ])
         
         # Auto-add suggestions if enabled
         if auto_add and all_suggestions:
-            added_count = 0
-            for tag in all_suggestions:
-                if chatbot.add_manual_tag(tag):
-                    added_count += 1
+            added_count = chatbot.add_manual_tags(all_suggestions)
             if added_count > 0:
                 st.success(f"🚀 Automatically added {added_count} new tags to your profile!")
                 st.rerun()
@@ -512,10 +508,7 @@ def _show_profile_interface(chatbot):
         # Add all suggestions button (only show if auto-add is disabled)
         if all_suggestions and not auto_add:
             if st.button("🚀 Add All Suggestions", key="add_all_suggestions"):
-                added_count = 0
-                for tag in all_suggestions:
-                    if chatbot.add_manual_tag(tag):
-                        added_count += 1
+                added_count = chatbot.add_manual_tags(all_suggestions)
                 st.success(f"Added {added_count} new tags to your profile!")
                 st.rerun()
         
@@ -525,7 +518,7 @@ def _show_profile_interface(chatbot):
             st.write(f"Found {len(all_suggestions)} unique suggestions across all categories:")
             for i, tag in enumerate(all_suggestions):
                 source = suggestion_sources.get(tag, "unknown")
-                source_emoji = {"ai": "🎯", "category": "📂", "synonym": "🔄", "related": "🔗"}.get(source, "❓")
+                source_emoji = SUGGESTION_SOURCE_EMOJIS.get(source, "❓")
                 col1, col2, col3 = st.columns([2, 1, 1])
                 with col1:
                     st.write(f"{source_emoji} {tag}")
@@ -584,6 +577,7 @@ def _show_profile_interface(chatbot):
         
         # Refresh suggestions button
         if st.button("🔄 Refresh Suggestions"):
+            chatbot.tag_analyzer.clear_suggestion_cache()
             st.rerun()
             
     else:
@@ -728,14 +722,7 @@ def _show_group_chat_interface(chatbot):
             st.rerun()
     
     # Display participants
-    participant_names = []
-    for uid in group_info['user_ids']:
-        if uid == "ai_bot":
-            participant_names.append("AI Assistant")
-        else:
-            user_profile = chatbot.db.get_user_profile(uid)
-            if user_profile:
-                participant_names.append(user_profile['name'])
+    participant_names = group_chat.get_participant_names(group_info)
     
     st.markdown(f"**Participants:** {', '.join(participant_names)}")
     
@@ -761,6 +748,15 @@ def _show_group_chat_interface(chatbot):
             st.success("Message sent!")
             st.rerun()
 
+# Render function for each navigation view
+VIEW_HANDLERS = {
+    'chat': _show_chat_interface,
+    'profile': _show_profile_interface,
+    'similar_users': _show_similar_users_interface,
+    'group_chats': _show_group_chats_interface,
+    'group_chat': _show_group_chat_interface
+}
+
 # Initialize DB
 if 'db' not in st.session_state:
     st.session_state['db'] = get_db()
@@ -769,6 +765,13 @@ if 'db' not in st.session_state:
 if 'current_view' not in st.session_state:
     st.session_state['current_view'] = 'chat'
 
+# Initialize tag discovery card state if not set
+if 'card_index' not in st.session_state:
+    st.session_state.card_index = 0
+
+if 'swiped_tags' not in st.session_state:
+    st.session_state.swiped_tags = {'liked': [], 'disliked': []}
+
 st.title("💬 AI Chatbot for Indian Users")
 st.markdown("### Connect with people who share your interests")
 st.markdown("*Powered by OpenAI, LangGraph, and MongoDB with cultural awareness*")
@@ -792,33 +795,17 @@ if session_manager.is_user_authenticated():
     st.sidebar.markdown(f"### 👤 User: {user_info['user_name']}")
     st.sidebar.markdown(f"**User ID:** `{user_info['user_id'][:8]}...`")
     
-    # Navigation menu
-    view_options = {
-        'chat': '💬 Chat',
-        'profile': '👤 Profile & Tags',
-        'similar_users': '🤝 Similar Users',
-        'group_chats': '👥 Group Chats',
-        'group_chat': '💬 Group Chat'
-    }
-    
     # Handle case where current_view might not be in main navigation
     current_view = st.session_state.get('current_view', 'chat')
-    if current_view not in view_options:
+    if current_view not in VIEW_INDEX:
         current_view = 'chat'
         st.session_state['current_view'] = 'chat'
     
-    # Get the index safely
-    try:
-        view_index = list(view_options.keys()).index(current_view)
-    except ValueError:
-        view_index = 0
-        st.session_state['current_view'] = 'chat'
-    
     selected_view = st.sidebar.selectbox(
         "Navigation",
-        options=list(view_options.keys()),
-        format_func=lambda x: view_options[x],
-        index=view_index
+        options=list(VIEW_OPTIONS),
+        format_func=VIEW_OPTIONS.get,
+        index=VIEW_INDEX[current_view]
     )
     
     if selected_view != current_view:
@@ -826,16 +813,7 @@ if session_manager.is_user_authenticated():
         st.rerun()
     
     # Display current view
-    if st.session_state['current_view'] == 'chat':
-        _show_chat_interface(chatbot)
-    elif st.session_state['current_view'] == 'profile':
-        _show_profile_interface(chatbot)
-    elif st.session_state['current_view'] == 'similar_users':
-        _show_similar_users_interface(chatbot)
-    elif st.session_state['current_view'] == 'group_chats':
-        _show_group_chats_interface(chatbot)
-    elif st.session_state['current_view'] == 'group_chat':
-        _show_group_chat_interface(chatbot)
+    VIEW_HANDLERS[st.session_state['current_view']](chatbot)
     
     # Logout button
     if st.sidebar.button("🚪 Logout"):
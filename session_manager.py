@@ -1,7 +1,10 @@
 import streamlit as st
 import json
 import uuid
-from datetime import datetime, timedelta
+import time
+
+# Session state entries that belong to the signed-in user
+USER_SESSION_KEYS = ('user_authenticated', 'user_id', 'user_name', 'chatbot', 'current_view')
 
 class SessionManager:
     def __init__(self):
@@ -14,7 +17,7 @@ class SessionManager:
             'user_id': user_id,
             'user_name': user_name,
             'authenticated': True,
-            'last_activity': datetime.now().isoformat()
+            'last_activity': time.time()  # Epoch seconds
         }
         
         # Save to Streamlit session state
@@ -35,10 +38,10 @@ class SessionManager:
         # First check URL parameters (most persistent)
         params = st.query_params
         
-        if 'user_id' in params and 'user_name' in params and 'authenticated' in params:
-            user_id = params['user_id']
-            user_name = params['user_name']
-            authenticated = params['authenticated'] == 'true'
+        user_id = params.get('user_id')
+        user_name = params.get('user_name')
+        if user_id is not None and user_name is not None:
+            authenticated = params.get('authenticated') == 'true'
             
             if authenticated:
                 # Restore session state
@@ -52,7 +55,7 @@ class SessionManager:
                 }
         
         # Fallback to session state
-        if 'user_authenticated' in st.session_state and st.session_state['user_authenticated']:
+        if st.session_state.get('user_authenticated'):
             return {
                 'user_id': st.session_state.get('user_id'),
                 'user_name': st.session_state.get('user_name'),
@@ -64,16 +67,8 @@ class SessionManager:
     def clear_user_session(self):
         """Clear user session from all storage"""
         # Clear session state
-        if 'user_authenticated' in st.session_state:
-            del st.session_state['user_authenticated']
-        if 'user_id' in st.session_state:
-            del st.session_state['user_id']
-        if 'user_name' in st.session_state:
-            del st.session_state['user_name']
-        if 'chatbot' in st.session_state:
-            del st.session_state['chatbot']
-        if 'current_view' in st.session_state:
-            del st.session_state['current_view']
+        for key in USER_SESSION_KEYS:
+            st.session_state.pop(key, None)
         
         # Clear URL parameters
         st.query_params.clear()
@@ -95,14 +90,14 @@ class SessionManager:
     
     def update_last_activity(self):
         """Update last activity timestamp"""
-        if self.is_user_authenticated():
+        # get_user_info is None unless authenticated, so the session is loaded once
+        user_info = self.get_user_info()
+        if user_info:
             # Update URL parameters with new timestamp
-            user_info = self.get_user_info()
-            if user_info:
-                st.query_params["user_id"] = user_info['user_id']
-                st.query_params["user_name"] = user_info['user_name']
-                st.query_params["authenticated"] = "true"
-                st.query_params["last_activity"] = datetime.now().isoformat()
+            st.query_params["user_id"] = user_info['user_id']
+            st.query_params["user_name"] = user_info['user_name']
+            st.query_params["authenticated"] = "true"
+            st.query_params["last_activity"] = str(int(time.time()))  # Epoch seconds
 
 # Global session manager instance
 session_manager = SessionManager() 
\ No newline at end of file
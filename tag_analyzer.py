@@ -1,36 +1,152 @@
 import re
-from collections import Counter
+import threading
+import functools
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import openai
 import os
 
+# Most suggestion results kept per TagAnalyzer before the least recently used is dropped
+SUGGESTION_CACHE_SIZE = 128
+
+# Characters a tag may contain: letters, digits, whitespace, hyphens and underscores
+VALID_TAG_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_]+$')
+
+# Common topic keywords for tag inference (fallback) - Enhanced with Indian context
+TOPIC_KEYWORDS = {
+    'technology': ['ai', 'machine learning', 'programming', 'software', 'tech', 'computer', 'code', 'algorithm', 'startup', 'digital india', 'upi', 'aadhaar'],
+    'sports': ['football', 'basketball', 'soccer', 'tennis', 'gym', 'workout', 'fitness', 'exercise', 'cricket', 'ipl', 'bcci', 'hockey', 'kabaddi', 'badminton'],
+    'music': ['music', 'song', 'artist', 'concert', 'album', 'playlist', 'genre', 'instrument', 'bollywood', 'classical', 'carnatic', 'hindustani', 'ghazal', 'qawwali'],
+    'food': ['cooking', 'recipe', 'restaurant', 'food', 'cuisine', 'chef', 'ingredients', 'dining', 'indian food', 'north indian', 'south indian', 'street food', 'biryani', 'curry', 'roti', 'dal'],
+    'travel': ['travel', 'vacation', 'trip', 'destination', 'hotel', 'flight', 'tourism', 'adventure', 'india travel', 'himalayas', 'goa', 'kerala', 'rajasthan', 'varanasi'],
+    'books': ['book', 'reading', 'novel', 'author', 'literature', 'fiction', 'non-fiction', 'library', 'hindi literature', 'bengali literature', 'marathi literature', 'tamil literature'],
+    'movies': ['movie', 'film', 'cinema', 'actor', 'director', 'theater', 'streaming', 'series', 'bollywood', 'tollywood', 'kollywood', 'regional cinema', 'art house'],
+    'science': ['science', 'research', 'experiment', 'discovery', 'theory', 'physics', 'chemistry', 'biology', 'isro', 'space research', 'ayurveda', 'yoga science'],
+    'business': ['business', 'startup', 'entrepreneur', 'marketing', 'finance', 'investment', 'company', 'msme', 'make in india', 'startup india', 'digital payments'],
+    'education': ['learning', 'study', 'course', 'university', 'school', 'education', 'academic', 'degree', 'iit', 'iim', 'upsc', 'competitive exams', 'online learning'],
+    'health': ['health', 'medical', 'doctor', 'wellness', 'medicine', 'treatment', 'symptoms', 'therapy', 'ayurveda', 'yoga', 'homeopathy', 'allopathy', 'ayush'],
+    'art': ['art', 'painting', 'drawing', 'creative', 'design', 'artist', 'gallery', 'exhibition', 'indian art', 'folk art', 'madhubani', 'warli', 'miniature painting'],
+    'gaming': ['game', 'gaming', 'video game', 'console', 'player', 'esports', 'streaming', 'mobile gaming', 'pubg', 'free fire', 'indian gaming'],
+    'politics': ['politics', 'government', 'policy', 'election', 'democracy', 'law', 'voting', 'parliament', 'state politics', 'local governance', 'panchayat'],
+    'environment': ['environment', 'climate', 'sustainability', 'green', 'recycling', 'nature', 'conservation', 'swachh bharat', 'clean india', 'solar energy', 'water conservation'],
+    'culture': ['culture', 'tradition', 'festival', 'religion', 'spirituality', 'temple', 'mosque', 'church', 'gurudwara', 'diwali', 'holi', 'eid', 'christmas', 'gurpurab'],
+    'languages': ['hindi', 'english', 'bengali', 'telugu', 'marathi', 'tamil', 'gujarati', 'kannada', 'odia', 'punjabi', 'assamese', 'sanskrit', 'urdu', 'regional languages'],
+    'fashion': ['fashion', 'clothing', 'style', 'designer', 'saree', 'kurta', 'salwar kameez', 'lehenga', 'ethnic wear', 'western wear', 'jewelry', 'accessories'],
+    'spirituality': ['spirituality', 'meditation', 'yoga', 'bhakti', 'guru', 'ashram', 'temple', 'pilgrimage', 'karma', 'dharma', 'moksha', 'enlightenment'],
+    'agriculture': ['agriculture', 'farming', 'farmer', 'crops', 'organic', 'pesticides', 'irrigation', 'krishi', 'mandi', 'farmer protests', 'agricultural technology']
+}
+
+# Topics related to each topic name, i.e. other topics with a keyword found in
+# that name; fixed for the keyword table, so computed once for the fallback path
+RELATED_TOPICS = {
+    tag: [topic for topic, keywords in TOPIC_KEYWORDS.items()
+          if topic != tag and any(kw in tag for kw in keywords)]
+    for tag in TOPIC_KEYWORDS
+}
+
+# Diverse tags offered for swiping until popularity is tracked in the DB; some
+# interests fit several groups, so duplicates are dropped (first position kept)
+POPULAR_TAGS = tuple(dict.fromkeys([
+    # Technology & Digital
+    'technology', 'programming', 'ai', 'startup', 'digital', 'mobile apps', 'web development', 'data science',
+    
+    # Entertainment & Media
+    'music', 'movies', 'bollywood', 'gaming', 'streaming', 'podcasts', 'comedy', 'dance',
+    
+    # Sports & Fitness
+    'sports', 'cricket', 'fitness', 'yoga', 'gym', 'running', 'swimming', 'badminton',
+    
+    # Food & Cuisine
+    'food', 'cooking', 'indian food', 'street food', 'biryani', 'desserts', 'healthy eating',
+    
+    # Travel & Adventure
+    'travel', 'adventure', 'hiking', 'photography', 'backpacking', 'road trips', 'international travel',
+    
+    # Arts & Culture
+    'art', 'culture', 'classical music', 'folk art', 'traditional crafts', 'painting', 'dance',
+    
+    # Business & Career
+    'business', 'entrepreneurship', 'career', 'finance', 'investing', 'marketing', 'consulting',
+    
+    # Education & Learning
+    'education', 'learning', 'online courses', 'languages', 'reading', 'writing', 'research',
+    
+    # Health & Wellness
+    'health', 'wellness', 'meditation', 'ayurveda', 'mental health', 'nutrition', 'fitness',
+    
+    # Lifestyle & Personal
+    'fashion', 'beauty', 'lifestyle', 'self-improvement', 'motivation', 'productivity', 'minimalism',
+    
+    # Social & Community
+    'community', 'volunteering', 'social work', 'networking', 'mentoring', 'leadership',
+    
+    # Creative & Hobbies
+    'photography', 'writing', 'poetry', 'music production', 'gardening', 'diy', 'crafts',
+    
+    # Regional & Cultural
+    'regional cinema', 'classical dance', 'folk music', 'traditional festivals', 'heritage',
+    
+    # Contemporary
+    'sustainability', 'environment', 'social media', 'influencer', 'content creation', 'digital nomad'
+]))
+
+def _log_errors(action):
+    """Decorate an LLM tag method so a failed call is logged and yields no tags"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                print(f"Error {action}: {e}")
+                return []
+        return wrapper
+    return decorator
+
 class TagAnalyzer:
     def __init__(self):
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.client = openai.OpenAI(api_key=self.api_key)
         
-        # Common topic keywords for tag inference (fallback) - Enhanced with Indian context
-        self.topic_keywords = {
-            'technology': ['ai', 'machine learning', 'programming', 'software', 'tech', 'computer', 'code', 'algorithm', 'startup', 'digital india', 'upi', 'aadhaar'],
-            'sports': ['football', 'basketball', 'soccer', 'tennis', 'gym', 'workout', 'fitness', 'exercise', 'cricket', 'ipl', 'bcci', 'hockey', 'kabaddi', 'badminton'],
-            'music': ['music', 'song', 'artist', 'concert', 'album', 'playlist', 'genre', 'instrument', 'bollywood', 'classical', 'carnatic', 'hindustani', 'ghazal', 'qawwali'],
-            'food': ['cooking', 'recipe', 'restaurant', 'food', 'cuisine', 'chef', 'ingredients', 'dining', 'indian food', 'north indian', 'south indian', 'street food', 'biryani', 'curry', 'roti', 'dal'],
-            'travel': ['travel', 'vacation', 'trip', 'destination', 'hotel', 'flight', 'tourism', 'adventure', 'india travel', 'himalayas', 'goa', 'kerala', 'rajasthan', 'varanasi'],
-            'books': ['book', 'reading', 'novel', 'author', 'literature', 'fiction', 'non-fiction', 'library', 'hindi literature', 'bengali literature', 'marathi literature', 'tamil literature'],
-            'movies': ['movie', 'film', 'cinema', 'actor', 'director', 'theater', 'streaming', 'series', 'bollywood', 'tollywood', 'kollywood', 'regional cinema', 'art house'],
-            'science': ['science', 'research', 'experiment', 'discovery', 'theory', 'physics', 'chemistry', 'biology', 'isro', 'space research', 'ayurveda', 'yoga science'],
-            'business': ['business', 'startup', 'entrepreneur', 'marketing', 'finance', 'investment', 'company', 'msme', 'make in india', 'startup india', 'digital payments'],
-            'education': ['learning', 'study', 'course', 'university', 'school', 'education', 'academic', 'degree', 'iit', 'iim', 'upsc', 'competitive exams', 'online learning'],
-            'health': ['health', 'medical', 'doctor', 'wellness', 'medicine', 'treatment', 'symptoms', 'therapy', 'ayurveda', 'yoga', 'homeopathy', 'allopathy', 'ayush'],
-            'art': ['art', 'painting', 'drawing', 'creative', 'design', 'artist', 'gallery', 'exhibition', 'indian art', 'folk art', 'madhubani', 'warli', 'miniature painting'],
-            'gaming': ['game', 'gaming', 'video game', 'console', 'player', 'esports', 'streaming', 'mobile gaming', 'pubg', 'free fire', 'indian gaming'],
-            'politics': ['politics', 'government', 'policy', 'election', 'democracy', 'law', 'voting', 'parliament', 'state politics', 'local governance', 'panchayat'],
-            'environment': ['environment', 'climate', 'sustainability', 'green', 'recycling', 'nature', 'conservation', 'swachh bharat', 'clean india', 'solar energy', 'water conservation'],
-            'culture': ['culture', 'tradition', 'festival', 'religion', 'spirituality', 'temple', 'mosque', 'church', 'gurudwara', 'diwali', 'holi', 'eid', 'christmas', 'gurpurab'],
-            'languages': ['hindi', 'english', 'bengali', 'telugu', 'marathi', 'tamil', 'gujarati', 'kannada', 'odia', 'punjabi', 'assamese', 'sanskrit', 'urdu', 'regional languages'],
-            'fashion': ['fashion', 'clothing', 'style', 'designer', 'saree', 'kurta', 'salwar kameez', 'lehenga', 'ethnic wear', 'western wear', 'jewelry', 'accessories'],
-            'spirituality': ['spirituality', 'meditation', 'yoga', 'bhakti', 'guru', 'ashram', 'temple', 'pilgrimage', 'karma', 'dharma', 'moksha', 'enlightenment'],
-            'agriculture': ['agriculture', 'farming', 'farmer', 'crops', 'organic', 'pesticides', 'irrigation', 'krishi', 'mandi', 'farmer protests', 'agricultural technology']
-        }
+        # Keyword tables are shared module constants, bound here for instance access
+        self.topic_keywords = TOPIC_KEYWORDS
+        self.related_topics = RELATED_TOPICS
+        
+        # LLM suggestion results keyed by (suggestion type, inputs); Streamlit reruns
+        # the profile page on every click, so repeat requests are served from here
+        self.suggestion_cache = OrderedDict()
+        self.suggestion_cache_lock = threading.Lock()  # generate_all_suggestions fills it from worker threads
+
+    def _tags_cache_key(self, user_tags):
+        """Order- and duplicate-insensitive cache key for a list of tags"""
+        return tuple(sorted({tag.lower().strip() for tag in user_tags}))
+
+    def _get_cached_suggestions(self, cache_key):
+        """Return cached suggestions for a key, or None if not cached"""
+        with self.suggestion_cache_lock:
+            cached = self.suggestion_cache.get(cache_key)
+            if cached is None:
+                return None
+            self.suggestion_cache.move_to_end(cache_key)
+            return list(cached)
+
+    def _cache_suggestions(self, cache_key, suggestions):
+        """Cache suggestions for a key, evicting the least recently used entries"""
+        with self.suggestion_cache_lock:
+            self.suggestion_cache[cache_key] = list(suggestions)
+            self.suggestion_cache.move_to_end(cache_key)
+            while len(self.suggestion_cache) > SUGGESTION_CACHE_SIZE:
+                self.suggestion_cache.popitem(last=False)
+
+    def clear_suggestion_cache(self):
+        """Drop all cached suggestions so the next request asks the LLM again"""
+        with self.suggestion_cache_lock:
+            self.suggestion_cache.clear()
+
+    def _parse_tag_list(self, text):
+        """Split a comma-separated LLM reply into lowercase tags, deduplicated in order"""
+        tags = (tag.strip().lower() for tag in text.split(','))
+        return list(dict.fromkeys(tag for tag in tags if tag))
 
     def analyze_conversation_for_tags(self, conversation):
         """Analyze conversation and infer tags based on content"""
@@ -48,16 +164,13 @@ class TagAnalyzer:
                     inferred_tags.append(topic)
                     break
         
-        # Use OpenAI to extract additional tags
-        try:
-            ai_tags = self._extract_tags_with_ai(conversation)
-            inferred_tags.extend(ai_tags)
-        except Exception as e:
-            print(f"Error extracting AI tags: {e}")
+        # Use OpenAI to extract additional tags (failures are logged by _log_errors)
+        inferred_tags.extend(self._extract_tags_with_ai(conversation))
         
         # Remove duplicates and return
-        return list(set(inferred_tags))
+        return list(dict.fromkeys(inferred_tags))
 
+    @_log_errors("in AI tag extraction")
     def _extract_tags_with_ai(self, conversation):
         """Use OpenAI to extract tags from conversation with Indian cultural context"""
         # Prepare conversation text
@@ -74,46 +187,56 @@ class TagAnalyzer:
         
         Tags:"""
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=50,
-                temperature=0.3
-            )
-            
-            tags_text = response.choices[0].message.content.strip()
-            # Parse comma-separated tags
-            tags = [tag.strip().lower() for tag in tags_text.split(',') if tag.strip()]
-            return tags
-        except Exception as e:
-            print(f"Error in AI tag extraction: {e}")
-            return []
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=50,
+            temperature=0.3
+        )
+        
+        tags_text = response.choices[0].message.content.strip()
+        # Parse comma-separated tags
+        tags = self._parse_tag_list(tags_text)
+        return tags
 
     def generate_dynamic_tag_suggestions(self, user_tags, conversation=None, language_preferences=None):
         """Generate dynamic tag suggestions using OpenAI LLM with language preferences"""
         if not user_tags:
             return []
         
+        lang_key = None
+        if language_preferences:
+            lang_key = (
+                language_preferences.get('native_language'),
+                tuple(language_preferences.get('preferred_languages', [])),
+                language_preferences.get('language_comfort_level', 'english')
+            )
+        cache_key = ('dynamic', self._tags_cache_key(user_tags), tuple(conversation[-10:]) if conversation else (), lang_key)
+        cached = self._get_cached_suggestions(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Prepare context for AI
-            context = f"User's current tags: {', '.join(user_tags)}"
+            context_parts = [f"User's current tags: {', '.join(user_tags)}"]
             if conversation:
                 conv_text = "\n".join([f"{role}: {msg}" for role, msg in conversation[-10:]])  # Last 10 messages
-                context += f"\nRecent conversation:\n{conv_text}"
+                context_parts.append(f"Recent conversation:\n{conv_text}")
+            context = "\n".join(context_parts)
             
             # Add language context
-            language_context = ""
+            language_parts = []
             if language_preferences:
                 native_lang = language_preferences.get('native_language')
                 preferred_langs = language_preferences.get('preferred_languages', [])
                 comfort_level = language_preferences.get('language_comfort_level', 'english')
                 
                 if native_lang:
-                    language_context += f"\nUser's native language: {native_lang}"
+                    language_parts.append(f"User's native language: {native_lang}")
                 if preferred_langs:
-                    language_context += f"\nUser's preferred languages: {', '.join(preferred_langs)}"
-                language_context += f"\nLanguage comfort level: {comfort_level}"
+                    language_parts.append(f"User's preferred languages: {', '.join(preferred_langs)}")
+                language_parts.append(f"Language comfort level: {comfort_level}")
+            language_context = "".join(f"\n{part}" for part in language_parts)
             
             prompt = f"""
             Based on the user's current tags and context, generate 8-12 additional tag suggestions that help connect people with shared interests.
@@ -149,13 +272,14 @@ class TagAnalyzer:
             )
             
             suggestions_text = response.choices[0].message.content.strip()
-            suggestions = [tag.strip().lower() for tag in suggestions_text.split(',') if tag.strip()]
+            suggestions = self._parse_tag_list(suggestions_text)
             
             # Filter out duplicates and existing tags
             existing_tags_set = set(user_tags)
-            unique_suggestions = [tag for tag in suggestions if tag not in existing_tags_set]
+            unique_suggestions = [tag for tag in suggestions if tag not in existing_tags_set][:10]  # Limit to 10 suggestions
             
-            return unique_suggestions[:10]  # Limit to 10 suggestions
+            self._cache_suggestions(cache_key, unique_suggestions)
+            return unique_suggestions
             
         except Exception as e:
             print(f"Error generating dynamic tag suggestions: {e}")
@@ -172,15 +296,12 @@ class TagAnalyzer:
         # Find related tags based on existing user tags
         related_tags = []
         for tag in user_tags:
-            if tag in self.topic_keywords:
-                # Add related topics
-                for topic, keywords in self.topic_keywords.items():
-                    if topic != tag and any(kw in tag for kw in keywords):
-                        related_tags.append(topic)
+            # Add related topics
+            related_tags.extend(self.related_topics.get(tag, []))
         
         # Combine and remove duplicates
         all_suggestions = conversation_tags + related_tags
-        return list(set(all_suggestions))
+        return list(dict.fromkeys(all_suggestions))
 
     def suggest_tags_based_on_interests(self, user_tags, conversation):
         """Enhanced tag suggestions using AI and conversation analysis"""
@@ -199,164 +320,140 @@ class TagAnalyzer:
         
         return unique_suggestions[:8]  # Return top 8 suggestions
 
+    def generate_all_suggestions(self, user_tags, conversation=None, language_preferences=None):
+        """Generate dynamic, category, synonym and related concept suggestions concurrently"""
+        # Each generator is an independent OpenAI round-trip, so run them side by side
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'ai': executor.submit(self.generate_dynamic_tag_suggestions, user_tags, conversation, language_preferences),
+                'category': executor.submit(self.generate_category_suggestions, user_tags),
+                'synonym': executor.submit(self.generate_synonym_suggestions, user_tags),
+                'related': executor.submit(self.generate_related_concept_suggestions, user_tags)
+            }
+            return {source: future.result() for source, future in futures.items()}
+
+    @_log_errors("generating category suggestions")
     def generate_category_suggestions(self, user_tags):
         """Generate category-based tag suggestions"""
         if not user_tags:
             return []
         
-        try:
-            prompt = f"""
-            Based on these user tags: {', '.join(user_tags)}
-            
-            Generate 5-8 broader category tags that encompass these interests.
-            Think of parent categories, industry sectors, or general domains.
-            Include Indian cultural categories, regional interests, and traditional domains.
-            Consider categories like: Indian culture, regional languages, traditional arts, contemporary India, etc.
-            
-            Return only the category tags as a comma-separated list.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.5
-            )
-            
-            categories_text = response.choices[0].message.content.strip()
-            categories = [cat.strip().lower() for cat in categories_text.split(',') if cat.strip()]
-            
-            # Filter out existing tags
-            existing_tags_set = set(user_tags)
-            unique_categories = [cat for cat in categories if cat not in existing_tags_set]
-            
-            return unique_categories
-            
-        except Exception as e:
-            print(f"Error generating category suggestions: {e}")
-            return []
+        cache_key = ('category', self._tags_cache_key(user_tags))
+        cached = self._get_cached_suggestions(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = f"""
+        Based on these user tags: {', '.join(user_tags)}
+        
+        Generate 5-8 broader category tags that encompass these interests.
+        Think of parent categories, industry sectors, or general domains.
+        Include Indian cultural categories, regional interests, and traditional domains.
+        Consider categories like: Indian culture, regional languages, traditional arts, contemporary India, etc.
+        
+        Return only the category tags as a comma-separated list.
+        """
+        
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=100,
+            temperature=0.5
+        )
+        
+        categories_text = response.choices[0].message.content.strip()
+        categories = self._parse_tag_list(categories_text)
+        
+        # Filter out existing tags
+        existing_tags_set = set(user_tags)
+        unique_categories = [cat for cat in categories if cat not in existing_tags_set]
+        
+        self._cache_suggestions(cache_key, unique_categories)
+        return unique_categories
 
+    @_log_errors("generating synonym suggestions")
     def generate_synonym_suggestions(self, user_tags):
         """Generate synonym-based tag suggestions"""
         if not user_tags:
             return []
         
-        try:
-            prompt = f"""
-            For each of these tags: {', '.join(user_tags)}
-            
-            Generate 2-3 synonyms or alternative terms that mean the same thing.
-            Include different ways to express the same concept.
-            Consider Indian language equivalents (Hindi, regional languages) and cultural variations.
-            Include both English and Indian language terms where appropriate.
-            
-            Return only the synonyms as a comma-separated list.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.6
-            )
-            
-            synonyms_text = response.choices[0].message.content.strip()
-            synonyms = [syn.strip().lower() for syn in synonyms_text.split(',') if syn.strip()]
-            
-            # Filter out existing tags
-            existing_tags_set = set(user_tags)
-            unique_synonyms = [syn for syn in synonyms if syn not in existing_tags_set]
-            
-            return unique_synonyms
-            
-        except Exception as e:
-            print(f"Error generating synonym suggestions: {e}")
-            return []
+        cache_key = ('synonym', self._tags_cache_key(user_tags))
+        cached = self._get_cached_suggestions(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = f"""
+        For each of these tags: {', '.join(user_tags)}
+        
+        Generate 2-3 synonyms or alternative terms that mean the same thing.
+        Include different ways to express the same concept.
+        Consider Indian language equivalents (Hindi, regional languages) and cultural variations.
+        Include both English and Indian language terms where appropriate.
+        
+        Return only the synonyms as a comma-separated list.
+        """
+        
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=150,
+            temperature=0.6
+        )
+        
+        synonyms_text = response.choices[0].message.content.strip()
+        synonyms = self._parse_tag_list(synonyms_text)
+        
+        # Filter out existing tags
+        existing_tags_set = set(user_tags)
+        unique_synonyms = [syn for syn in synonyms if syn not in existing_tags_set]
+        
+        self._cache_suggestions(cache_key, unique_synonyms)
+        return unique_synonyms
 
+    @_log_errors("generating related concept suggestions")
     def generate_related_concept_suggestions(self, user_tags):
         """Generate related concept suggestions"""
         if not user_tags:
             return []
         
-        try:
-            prompt = f"""
-            Based on these user interests: {', '.join(user_tags)}
-            
-            Generate 5-8 closely related concepts, emerging trends, or adjacent topics.
-            Think of what someone with these interests might also be interested in.
-            Include Indian cultural context, regional interests, traditional practices, and contemporary Indian topics.
-            Consider both global and Indian-specific related concepts.
-            
-            Return only the related concepts as a comma-separated list.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            concepts_text = response.choices[0].message.content.strip()
-            concepts = [concept.strip().lower() for concept in concepts_text.split(',') if concept.strip()]
-            
-            # Filter out existing tags
-            existing_tags_set = set(user_tags)
-            unique_concepts = [concept for concept in concepts if concept not in existing_tags_set]
-            
-            return unique_concepts
-            
-        except Exception as e:
-            print(f"Error generating related concept suggestions: {e}")
-            return []
+        cache_key = ('related', self._tags_cache_key(user_tags))
+        cached = self._get_cached_suggestions(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = f"""
+        Based on these user interests: {', '.join(user_tags)}
+        
+        Generate 5-8 closely related concepts, emerging trends, or adjacent topics.
+        Think of what someone with these interests might also be interested in.
+        Include Indian cultural context, regional interests, traditional practices, and contemporary Indian topics.
+        Consider both global and Indian-specific related concepts.
+        
+        Return only the related concepts as a comma-separated list.
+        """
+        
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=150,
+            temperature=0.7
+        )
+        
+        concepts_text = response.choices[0].message.content.strip()
+        concepts = self._parse_tag_list(concepts_text)
+        
+        # Filter out existing tags
+        existing_tags_set = set(user_tags)
+        unique_concepts = [concept for concept in concepts if concept not in existing_tags_set]
+        
+        self._cache_suggestions(cache_key, unique_concepts)
+        return unique_concepts
 
     def get_popular_tags(self, db, limit=25):
         """Get most popular tags across all users with diverse interests"""
         # This would need to be implemented in the DB class
         # For now, return a diverse set of tags for swiping
-        return [
-            # Technology & Digital
-            'technology', 'programming', 'ai', 'startup', 'digital', 'mobile apps', 'web development', 'data science',
-            
-            # Entertainment & Media
-            'music', 'movies', 'bollywood', 'gaming', 'streaming', 'podcasts', 'comedy', 'dance',
-            
-            # Sports & Fitness
-            'sports', 'cricket', 'fitness', 'yoga', 'gym', 'running', 'swimming', 'badminton',
-            
-            # Food & Cuisine
-            'food', 'cooking', 'indian food', 'street food', 'biryani', 'desserts', 'healthy eating',
-            
-            # Travel & Adventure
-            'travel', 'adventure', 'hiking', 'photography', 'backpacking', 'road trips', 'international travel',
-            
-            # Arts & Culture
-            'art', 'culture', 'classical music', 'folk art', 'traditional crafts', 'painting', 'dance',
-            
-            # Business & Career
-            'business', 'entrepreneurship', 'career', 'finance', 'investing', 'marketing', 'consulting',
-            
-            # Education & Learning
-            'education', 'learning', 'online courses', 'languages', 'reading', 'writing', 'research',
-            
-            # Health & Wellness
-            'health', 'wellness', 'meditation', 'ayurveda', 'mental health', 'nutrition', 'fitness',
-            
-            # Lifestyle & Personal
-            'fashion', 'beauty', 'lifestyle', 'self-improvement', 'motivation', 'productivity', 'minimalism',
-            
-            # Social & Community
-            'community', 'volunteering', 'social work', 'networking', 'mentoring', 'leadership',
-            
-            # Creative & Hobbies
-            'photography', 'writing', 'poetry', 'music production', 'gardening', 'diy', 'crafts',
-            
-            # Regional & Cultural
-            'regional cinema', 'classical dance', 'folk music', 'traditional festivals', 'heritage',
-            
-            # Contemporary
-            'sustainability', 'environment', 'social media', 'influencer', 'content creation', 'digital nomad'
-        ]
+        return list(POPULAR_TAGS)
 
     def clean_tag(self, tag):
         """Clean and normalize a tag"""
@@ -367,6 +464,8 @@ class TagAnalyzer:
         # Basic validation - can be extended
         if len(tag) < 2 or len(tag) > 50:
             return False
-        if not re.match(r'^[a-zA-Z0-9\s\-_]+$', tag):
+        if tag.isascii() and tag.isalnum():
+            return True  # Common single-word case, no regex needed
+        if not VALID_TAG_PATTERN.match(tag):
             return False
         return True 
\ No newline at end of file